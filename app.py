@@ -1,49 +1,66 @@
+import hashlib
 import os
 import re
 import time
-import torch
+from pathlib import Path
 import types
 import streamlit as st
-
-# PyTorch + Streamlit fix (optional)
-if isinstance(torch.classes, types.ModuleType):
-    try:
-        torch.classes.__path__ = []
-    except Exception:
-        pass
+from concurrent.futures import ThreadPoolExecutor
 
 # --- Import your utils ---
+# Only the lightweight text stack is imported up front; the video stack
+# (faster-whisper, cv2, tesserocr, yt-dlp) is loaded by load_video_stack()
 try:
-    from utils.downloader import download_audio_from_youtube, download_video_from_youtube
-    from utils.transcriber import transcribe_audio, load_whisper_model
     from utils.text_analyzer import detect_language, detect_trigger_words
     from utils.verifier import verify_with_bard
-    from utils.video_processor import analyze_video_for_duplicates, extract_visible_text_from_frames
 except ImportError:
     # Mock implementations for demonstration/testing
-    def download_audio_from_youtube(url): return "audio.mp3"
-    def download_video_from_youtube(url): return ("video.mp4", None, None)
-    def transcribe_audio(model, audio_path): return "This is a test transcript."
-    def load_whisper_model(): return None
     def detect_language(text): return "en"
     def detect_trigger_words(text, lang): 
         example_triggers = {"en": ["fake", "false", "misinformation"]}
         return [w for w in example_triggers.get(lang, []) if w in text.lower()]
-    def verify_with_bard(text, api_key=None): 
+    def verify_with_bard(text): 
         return "This news appears to be false because it contains misinformation."
-    def analyze_video_for_duplicates(video_path):
-        return {
-            "total_frames_extracted": 100,
-            "duplicate_count": 5,
-            "duplicate_frame_pairs": [{"frame1": 10, "frame2": 15}]
-        }
-    def extract_visible_text_from_frames(video_path): return "Visible text from video frames."
+
+def load_video_stack():
+    """Import the video/audio utils on first use so text-only sessions skip them."""
+    try:
+        from utils.downloader import download_video_from_youtube, extract_audio_from_video
+        from utils.transcriber import transcribe_audio, load_whisper_model
+        from utils.video_processor import analyze_video, load_ocr_api
+    except ImportError:
+        # Mock implementations for demonstration/testing
+        def download_video_from_youtube(url): return ("video.mp4", None, None)
+        def extract_audio_from_video(video_path): return "audio.wav"
+        def transcribe_audio(model, audio_path): return "This is a test transcript."
+        def load_whisper_model(): return None
+        def load_ocr_api(): return None
+        def analyze_video(video_path, ocr_api=None):
+            return {
+                "total_frames_extracted": 100,
+                "duplicate_count": 5,
+                "duplicate_frame_pairs": [{"frame1": 10, "frame2": 15}]
+            }, "Visible text from video frames."
+
+    return types.SimpleNamespace(
+        download_video_from_youtube=download_video_from_youtube,
+        extract_audio_from_video=extract_audio_from_video,
+        transcribe_audio=transcribe_audio,
+        load_whisper_model=load_whisper_model,
+        analyze_video=analyze_video,
+        load_ocr_api=load_ocr_api,
+    )
 
 # Helpers
+# Tags and timestamps are stripped in a single pass over the text
+_TAG_OR_TS_RE = re.compile(r'<[^>]+>|\b\d{1,2}:\d{2}(?::\d{2}(?:\.\d{1,3})?)?\b')
+_WS_RE = re.compile(r'\s+')
+# VTT cue numbers, cue timing lines and blank lines
+_VTT_NOISE_RE = re.compile(r'^[ \t]*(?:\d+|.*-->.*)?[ \t]*$', re.MULTILINE)
+
 def remove_timestamps_and_tags(text):
-    text = re.sub(r'\b\d{1,2}:\d{2}(:\d{2}(\.\d{1,3})?)?\b', '', text)
-    text = re.sub(r'<[^>]+>', '', text)
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _TAG_OR_TS_RE.sub('', text)
+    text = _WS_RE.sub(' ', text).strip()
     return text
 
 def clean_extracted_text(text):
@@ -59,10 +76,29 @@ def create_verification_prompt(text):
         f"News content:\n{text}"
     )
 
-@st.cache_data(show_spinner=False)
-def cached_verify_with_bard(text, api_key):
-    # Pass api_key to your real verify_with_bard
-    return verify_with_bard(text, api_key=api_key)
+# Verdicts are reused for this long. Streamlit ignores `ttl` for disk-persisted
+# caches, so expiry is done by putting the current time bucket in the key.
+VERIFY_CACHE_TTL = 7 * 24 * 60 * 60  # seconds
+
+# Failure markers from utils.verifier ("Bard Error") and bardapi ("Response Error")
+_VERIFY_ERROR_PREFIXES = ("Bard Error", "Response Error")
+
+def normalize_for_cache(text):
+    return _WS_RE.sub(' ', text).strip().lower()
+
+@st.cache_data(persist="disk", show_spinner=False)
+def _cached_verify_with_bard(prompt_hash, ttl_bucket, _text):
+    # Only prompt_hash and ttl_bucket form the cache key; underscored args are not hashed
+    result = verify_with_bard(_text)
+    if isinstance(result, str) and result.startswith(_VERIFY_ERROR_PREFIXES):
+        # Raise so the failure is not persisted as a cached answer
+        raise RuntimeError(result)
+    return result
+
+def cached_verify_with_bard(text):
+    prompt_hash = hashlib.sha256(normalize_for_cache(text).encode("utf-8")).hexdigest()[:16]
+    ttl_bucket = int(time.time() // VERIFY_CACHE_TTL)
+    return _cached_verify_with_bard(prompt_hash, ttl_bucket, text)
 
 def get_youtube_thumbnail_fallback(url):
     video_id_match = re.search(r"(?:v=|\/)([0-9A-Za-z_-]{11}).*", url)
@@ -71,19 +107,17 @@ def get_youtube_thumbnail_fallback(url):
     return None
 
 def vtt_to_plaintext(vtt_path):
-    text_lines = []
-    with open(vtt_path, 'r', encoding='utf-8', errors='ignore') as file:
-        for line in file:
-            line = line.strip()
-            if not line or '-->' in line or re.match(r'^\d+$', line):
-                continue
-            text_lines.append(line)
-    return " ".join(text_lines)
-
-def process_video_and_audio(video_path, audio_path, subtitle_path, downloaded_thumbnail, url, bard_api_key):
-    st.write("Analyzing video...")
+    text = Path(vtt_path).read_text(encoding='utf-8', errors='ignore')
+    text = _VTT_NOISE_RE.sub('', text)
+    return _WS_RE.sub(' ', text).strip()
 
-    model = load_whisper_model()
+def timed(func, *args, **kwargs):
+    start = time.time()
+    result = func(*args, **kwargs)
+    return result, time.time() - start
+
+def process_video_and_audio(video, model, ocr_api, video_path, audio_path, subtitle_path, downloaded_thumbnail, url):
+    st.write("Analyzing video...")
 
     thumbnail_url = None
     if downloaded_thumbnail and os.path.exists(downloaded_thumbnail):
@@ -93,19 +127,23 @@ def process_video_and_audio(video_path, audio_path, subtitle_path, downloaded_th
     if thumbnail_url:
         st.image(thumbnail_url, caption="Thumbnail", use_column_width=True)
 
-    with st.spinner("Transcribing audio..."):
-        start_transcribe = time.time()
-        transcript = transcribe_audio(model, audio_path)
-        trans_time = time.time() - start_transcribe
+    # Whisper and the OpenCV/Tesseract frame pass work on disjoint data and
+    # release the GIL, so run them side by side instead of back to back. The
+    # cached model and OCR handle were loaded on the script thread, so the
+    # workers never touch st.cache_resource.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        trans_future = pool.submit(timed, video.transcribe_audio, model, audio_path)
+        dup_future = pool.submit(timed, video.analyze_video, video_path, ocr_api=ocr_api)
 
-    with st.spinner("Checking for duplicate frames..."):
-        start_dup = time.time()
-        duplicate_report = analyze_video_for_duplicates(video_path)
-        dup_time = time.time() - start_dup
+        with st.spinner("Checking for duplicate frames and extracting text..."):
+            (duplicate_report, frame_text), dup_time = dup_future.result()
+
+        with st.spinner("Transcribing audio..."):
+            transcript, trans_time = trans_future.result()
 
     st.write(f"🧩 Frames extracted: {duplicate_report['total_frames_extracted']}")
     st.write(f"🔁 Duplicates: {duplicate_report['duplicate_count']}")
-    st.write(f"⏱ Duplicate analysis: **{dup_time:.2f} sec**")
+    st.write(f"⏱ Frame analysis: **{dup_time:.2f} sec**")
     if duplicate_report['duplicate_count'] > 0:
         with st.expander("Duplicate Frame Pairs"):
             st.dataframe(duplicate_report['duplicate_frame_pairs'])
@@ -124,8 +162,6 @@ def process_video_and_audio(video_path, audio_path, subtitle_path, downloaded_th
         with st.expander("📺 Subtitles"):
             st.text_area("Extracted Subtitles", subtitle_text, height=150)
 
-    with st.spinner("Extracting text from video frames..."):
-        frame_text = extract_visible_text_from_frames(video_path)
     if frame_text:
         with st.expander("🔤 Text in Frames"):
             st.text_area("Detected Text", frame_text, height=150)
@@ -138,7 +174,7 @@ def process_video_and_audio(video_path, audio_path, subtitle_path, downloaded_th
     with st.spinner("Getting verification..."):
         try:
             start_verify = time.time()
-            verification = cached_verify_with_bard(verification_prompt, bard_api_key)
+            verification = cached_verify_with_bard(verification_prompt)
             verify_time = time.time() - start_verify
             confidence = 0.9
         except Exception as e:
@@ -151,13 +187,18 @@ def process_video_and_audio(video_path, audio_path, subtitle_path, downloaded_th
         st.write(f"🔍 Confidence: **{confidence * 100:.2f}%**")
         st.write(f"⏱ Verification time: **{verify_time:.2f} sec**")
 
+def warm_video_models(video):
+    # Called after the input widget is rendered, so the user can type a URL or
+    # pick a file while the cached resources load on the first run. Both are
+    # loaded here on the script thread, where st.cache_resource has its context.
+    with st.spinner("Loading speech and OCR models..."):
+        return video.load_whisper_model(), video.load_ocr_api()
+
 def main():
     if "BARD_API_KEY" not in st.secrets:
         st.error("❌ BARD_API_KEY not found in Streamlit secrets.")
         return
 
-    bard_api_key = st.secrets["BARD_API_KEY"]
-
     st.set_page_config(
         page_title="Fake News Detection App",
         page_icon="icon.ico"
@@ -167,6 +208,8 @@ def main():
 
     input_type = st.radio("Select input type:", ("Text", "YouTube URL", "Upload Video File"))
 
+    video = load_video_stack() if input_type != "Text" else None
+
     if input_type == "Text":
         uploaded_file = st.file_uploader("Upload a text file (.txt)", type=["txt"])
         if uploaded_file:
@@ -183,7 +226,7 @@ def main():
             with st.spinner("Verifying with Bard..."):
                 try:
                     start = time.time()
-                    verification = cached_verify_with_bard(verification_prompt, bard_api_key)
+                    verification = cached_verify_with_bard(verification_prompt)
                     elapsed = time.time() - start
                     confidence = 0.85
                 except Exception as e:
@@ -198,30 +241,33 @@ def main():
 
     elif input_type == "YouTube URL":
         url = st.text_input("Enter YouTube video URL")
+        model, ocr_api = warm_video_models(video)
         if url:
             with st.spinner("Downloading and processing video/audio..."):
                 try:
-                    video_path, subtitle_path, downloaded_thumbnail = download_video_from_youtube(url)
-                    audio_path = download_audio_from_youtube(url)
+                    video_path, subtitle_path, downloaded_thumbnail = video.download_video_from_youtube(url)
+                    # Pull the audio out of the mp4 locally instead of downloading it again
+                    audio_path = video.extract_audio_from_video(video_path) if video_path else None
                 except Exception as e:
                     st.error(f"Download failed: {e}")
                     return
 
                 if video_path and audio_path:
-                    process_video_and_audio(video_path, audio_path, subtitle_path, downloaded_thumbnail, url, bard_api_key)
+                    process_video_and_audio(video, model, ocr_api, video_path, audio_path, subtitle_path, downloaded_thumbnail, url)
                 else:
                     st.error("Video or audio download failed.")
 
     elif input_type == "Upload Video File":
         uploaded_video = st.file_uploader("Upload a video file", type=["mp4", "mov", "avi", "mkv"])
+        model, ocr_api = warm_video_models(video)
         if uploaded_video:
             video_path = f"/tmp/{uploaded_video.name}"
             with open(video_path, "wb") as f:
                 f.write(uploaded_video.getbuffer())
-            audio_path = video_path  # assuming audio embedded in video
+            audio_path = video_path  # faster-whisper decodes the embedded audio itself
             subtitle_path = None
             downloaded_thumbnail = None
-            process_video_and_audio(video_path, audio_path, subtitle_path, downloaded_thumbnail, None, bard_api_key)
+            process_video_and_audio(video, model, ocr_api, video_path, audio_path, subtitle_path, downloaded_thumbnail, None)
 
 if __name__ == "__main__":
     main()
@@ -1,4 +1,5 @@
 import os
+import subprocess
 import yt_dlp
 
 def download_video_from_youtube(url, save_dir="saved_videos"):
@@ -20,6 +21,7 @@ def download_video_from_youtube(url, save_dir="saved_videos"):
         'outtmpl': os.path.join(save_dir, '%(id)s.%(ext)s'),
         'quiet': True,
         'no_warnings': True,
+        'concurrent_fragment_downloads': 4,
         'writesubtitles': True,
         'writeautomaticsub': True,
         'subtitleslangs': ['en'],
@@ -50,34 +52,30 @@ def download_video_from_youtube(url, save_dir="saved_videos"):
         return ydl.prepare_filename(info), subtitle_path, thumbnail_path
 
 
-def download_audio_from_youtube(url, save_dir="saved_audios"):
+def extract_audio_from_video(video_path, save_dir="saved_audios"):
     """
-    Download audio from YouTube and convert to MP3.
+    Demux the audio track of a local video into 16 kHz mono WAV with ffmpeg.
 
     Args:
-        url (str): YouTube video URL
-        save_dir (str): Directory to save downloaded audio
+        video_path (str): Path to an already-downloaded video
+        save_dir (str): Directory to save the extracted audio
 
     Returns:
-        str or None: MP3 file path or None if failed
+        str or None: WAV file path or None if failed
     """
     os.makedirs(save_dir, exist_ok=True)
 
-    ydl_opts = {
-        'format': 'bestaudio/best',
-        'outtmpl': os.path.join(save_dir, '%(id)s.%(ext)s'),
-        'quiet': True,
-        'no_warnings': True,
-        'postprocessors': [{
-            'key': 'FFmpegExtractAudio',
-            'preferredcodec': 'mp3',
-            'preferredquality': '192',
-        }],
-    }
-
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        info = ydl.extract_info(url, download=True)
-        mp3_path = os.path.splitext(ydl.prepare_filename(info))[0] + ".mp3"
-        if os.path.exists(mp3_path):
-            return mp3_path
-        return None
\ No newline at end of file
+    name = os.path.splitext(os.path.basename(video_path))[0]
+    wav_path = os.path.join(save_dir, name + ".wav")
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-y", "-loglevel", "error", "-i", video_path,
+             "-vn", "-ac", "1", "-ar", "16000", "-f", "wav", wav_path],
+            capture_output=True,
+        )
+    except OSError:
+        # ffmpeg binary missing or not executable
+        return None
+    if result.returncode == 0 and os.path.exists(wav_path):
+        return wav_path
+    return None
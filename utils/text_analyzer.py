@@ -1,17 +1,9 @@
+from functools import lru_cache
 from langdetect import detect
 from langdetect.lang_detect_exception import LangDetectException
-import json
-
-# Load trigger words from JSON file
-import os
-TRIGGER_WORDS_PATH = os.path.join(os.path.dirname(__file__), '..', 'trigger_words.json')
-
-def load_trigger_words():
-    with open(TRIGGER_WORDS_PATH, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-TRIGGER_WORDS = load_trigger_words()
+from utils.triggers import TRIGGER_AUTOMATA, TRIGGER_WORDS
 
+@lru_cache(maxsize=1024)
 def detect_language(text):
     try:
         lang = detect(text)
@@ -22,8 +14,10 @@ def detect_language(text):
         return "en"
 
 def detect_trigger_words(text, lang):
-    triggers = TRIGGER_WORDS.get(lang, TRIGGER_WORDS.get("en", []))
-    found = [w for w in triggers if w.lower() in text.lower()]
-    return list(set(found))
+    automaton = TRIGGER_AUTOMATA.get(lang) if lang in TRIGGER_WORDS else TRIGGER_AUTOMATA.get("en")
+    if automaton is None:
+        return []
+    found = {w for _, w in automaton.iter(text.lower())}
+    return list(found)
 
 
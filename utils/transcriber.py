@@ -1,10 +1,30 @@
-import whisper
+import os
+import ctranslate2
 import streamlit as st
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+
+# Lower this on small GPUs if batched decoding runs out of memory
+WHISPER_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "16"))
+# Overrides the default of float16 on CUDA / int8 on CPU (e.g. "int8_float16" for low-VRAM GPUs)
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE")
 
 @st.cache_resource(show_spinner=False)
 def load_whisper_model():
-    return whisper.load_model("base")
+    # CTranslate2 (bundled with faster-whisper) reports CUDA devices without torch
+    cuda = ctranslate2.get_cuda_device_count() > 0
+    model = WhisperModel(
+        "base",
+        device="cuda" if cuda else "cpu",
+        compute_type=WHISPER_COMPUTE_TYPE or ("float16" if cuda else "int8"),
+    )
+    return BatchedInferencePipeline(model=model)
 
 def transcribe_audio(model, audio_path):
-    result = model.transcribe(audio_path)
-    return result["text"]
+    segments, _ = model.transcribe(
+        audio_path,
+        batch_size=WHISPER_BATCH_SIZE,
+        beam_size=1,
+        # BatchedInferencePipeline's Silero VAD defaults already cut silences of 160 ms or more
+        vad_filter=True,
+    )
+    return "".join(s.text for s in segments)
@@ -0,0 +1,28 @@
+from pathlib import Path
+from types import MappingProxyType
+import ahocorasick
+import orjson
+
+# Load trigger words from JSON file once per process and share them read-only
+TRIGGER_WORDS_PATH = Path(__file__).parent.parent / 'trigger_words.json'
+
+def load_trigger_words():
+    words = orjson.loads(TRIGGER_WORDS_PATH.read_bytes())
+    return MappingProxyType({lang: tuple(ws) for lang, ws in words.items()})
+
+TRIGGER_WORDS = load_trigger_words()
+
+def build_trigger_automata(trigger_words):
+    # One Aho-Corasick automaton per language, matching lowercased words in a single pass
+    automata = {}
+    for lang, words in trigger_words.items():
+        if not words:
+            continue
+        automaton = ahocorasick.Automaton()
+        for w in words:
+            automaton.add_word(w.lower(), w)
+        automaton.make_automaton()
+        automata[lang] = automaton
+    return MappingProxyType(automata)
+
+TRIGGER_AUTOMATA = build_trigger_automata(TRIGGER_WORDS)
@@ -1,6 +1,9 @@
 import os
+import threading
+import time
 from dotenv import load_dotenv
 from bardapi import Bard
+from requests.exceptions import Timeout
 
 load_dotenv()
 
@@ -8,7 +11,52 @@ token = os.getenv("BARD_API_KEY")
 if not token:
     raise ValueError("BARD_API_KEY not found in environment variables.")
 
-bard = Bard(token=token)
+# bardapi applies this per-request timeout (seconds) to its HTTP calls
+BARD_TIMEOUT = 15
+BARD_ATTEMPTS = 3
+BARD_BACKOFF = 1.0  # seconds, doubled after each failed attempt
+
+bard = Bard(token=token, timeout=BARD_TIMEOUT)
+
+# bardapi's "Response Error" content does not carry the HTTP status, and it is
+# also used for permanent failures (bad cookie, unparsable body). Record the
+# status of the last response per thread so only 429/5xx are retried.
+_last_response = threading.local()
+
+def _record_status(response, *args, **kwargs):
+    _last_response.status_code = response.status_code
+
+bard.session.hooks["response"].append(_record_status)
+
+def is_transient_status(status_code) -> bool:
+    return status_code is not None and (status_code == 429 or status_code >= 500)
+
+def get_answer_with_retry(prompt: str) -> dict:
+    """
+    Call Bard, retrying with exponential backoff on timeouts and on
+    "Response Error" answers whose HTTP status was 429 or 5xx. Other
+    Response Errors are returned immediately.
+
+    Returns:
+        dict: Bard's response; the last "Response Error" one if every attempt failed.
+
+    Raises:
+        Timeout: If the last attempt timed out.
+    """
+    for attempt in range(BARD_ATTEMPTS):
+        last_attempt = attempt == BARD_ATTEMPTS - 1
+        _last_response.status_code = None
+        try:
+            response = bard.get_answer(prompt)
+        except Timeout:
+            if last_attempt:
+                raise
+        else:
+            if not str(response.get('content', '')).startswith("Response Error"):
+                return response
+            if last_attempt or not is_transient_status(_last_response.status_code):
+                return response
+        time.sleep(BARD_BACKOFF * 2 ** attempt)
 
 def verify_with_bard(text: str) -> str:
     """
@@ -27,7 +75,7 @@ def verify_with_bard(text: str) -> str:
         f"{text}"
     )
     try:
-        response = bard.get_answer(prompt)
+        response = get_answer_with_retry(prompt)
         return response['content']
     except Exception as e:
         return f"Bard Error: {e}"
\ No newline at end of file
@@ -2,63 +2,216 @@ import cv2
 import numpy as np
 import os
 import pandas as pd
-import pytesseract
+import streamlit as st
+import tesserocr
+import threading
 from collections import defaultdict
-from skimage.metrics import structural_similarity as ssim
+from PIL import Image
+
+# For Windows users: point TESSDATA_PREFIX at your tessdata folder,
+# e.g. C:\Program Files\Tesseract-OCR\tessdata
+TESSDATA_PATH = os.getenv("TESSDATA_PREFIX", tesserocr.get_languages()[0])
+OCR_LANGS = 'eng+tel+hin'  # Extend with more languages as needed
+
+# The Tesseract handle is shared across Streamlit sessions but is not thread-safe
+_OCR_LOCK = threading.Lock()
+
+
+@st.cache_resource(show_spinner=False)
+def load_ocr_api():
+    """Keep one Tesseract handle resident instead of spawning a process per frame."""
+    return tesserocr.PyTessBaseAPI(path=TESSDATA_PATH, lang=OCR_LANGS)
 
-# For Windows users: set the path to your installed Tesseract executable
-# pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
-pytesseract.pytesseract.tesseract_cmd = "C:\\Program Files\\Tesseract-OCR\\tesseract.exe"
-def extract_visible_text_from_frames(video_path, frame_skip=30):
-    cap = cv2.VideoCapture(video_path)
-    visible_text = []
 
-    frame_count = 0
-    success, frame = cap.read()
+def ocr_image(api, gray):
+    api.SetImage(Image.fromarray(gray))
+    return api.GetUTF8Text()
 
-    while success:
-        if frame_count % frame_skip == 0:
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            text = pytesseract.image_to_string(gray, lang='eng+tel+hin')  # Extend with more languages as needed
-            if text.strip():
-                visible_text.append(text.strip())
-        frame_count += 1
-        success, frame = cap.read()
 
-    cap.release()
-    return "\n".join(visible_text)
+# FFmpeg seeks restart decoding at the previous keyframe (x264 defaults to
+# keyint=250), so seeking is only cheaper than grab() for very long strides
+SEEK_MIN_STRIDE = 1000
 
 
-def analyze_video_for_duplicates(video_path, frame_skip=5, similarity_threshold=0.97):
-    cap = cv2.VideoCapture(video_path)
-    frame_id = 0
-    prev_frame = None
-    duplicate_pairs = []
-    total_frames = 0
+def iter_gray_frames(video_path, frame_skip):
+    """
+    Yield (frame_id, gray) for every `frame_skip`-th frame of a video.
 
-    frames = []
+    Frames are walked sequentially with grab(), and only kept frames are
+    retrieve()d. Strides of SEEK_MIN_STRIDE or more seek with
+    CAP_PROP_POS_FRAMES instead, since each seek re-decodes from the previous
+    keyframe and only pays off when it skips several GOPs. Decoding uses
+    hardware acceleration when FFmpeg has one available.
 
-    while True:
+    The same BGR and grayscale buffers are reused for every frame, so callers
+    must copy `gray` if they keep it past the next iteration.
+    """
+    cap = cv2.VideoCapture(
+        video_path, cv2.CAP_FFMPEG,
+        [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY],
+    )
+    if not cap.isOpened():
+        cap = cv2.VideoCapture(video_path)
+
+    try:
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         ret, frame = cap.read()
         if not ret:
-            break
-        if frame_id % frame_skip == 0:
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            frames.append((frame_id, gray))
-            total_frames += 1
-        frame_id += 1
-
-    for i in range(len(frames) - 1):
-        id1, f1 = frames[i]
-        id2, f2 = frames[i + 1]
-        score = ssim(f1, f2)
-        if score > similarity_threshold:
-            duplicate_pairs.append((id1, id2))
-
-    cap.release()
+            return
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        yield 0, gray
+
+        seekable = (
+            frame_skip >= SEEK_MIN_STRIDE
+            and total > 0
+            and cap.set(cv2.CAP_PROP_POS_FRAMES, frame_skip)
+        )
+        frame_id = frame_skip if seekable else 1
+
+        while True:
+            if seekable:
+                if frame_id >= total or not cap.set(cv2.CAP_PROP_POS_FRAMES, frame_id):
+                    break
+                ret, frame = cap.read(frame)
+            else:
+                if not cap.grab():
+                    break
+                if frame_id % frame_skip != 0:
+                    frame_id += 1
+                    continue
+                ret, frame = cap.retrieve(frame)
+            if not ret:
+                break
+            cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray)
+            yield frame_id, gray
+            frame_id += frame_skip if seekable else 1
+    finally:
+        cap.release()
+
+
+def compute_phash(gray):
+    """64-bit DCT perceptual hash of a grayscale frame, packed into a np.uint64."""
+    small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA)
+    low = cv2.dct(np.float32(small))[:8, :8]
+    bits = (low > np.median(low)).flatten()
+    return np.packbits(bits).view(np.uint64)[0]
+
+
+def hamming_distance(a, b):
+    """Bitwise Hamming distance between pHash values (scalars or arrays)."""
+    return np.bitwise_count(np.bitwise_xor(a, b))
+
+
+# Rows of the all-pairs distance matrix processed per block: 256 x N uint64,
+# about 44 MB for an hour of video at frame_skip=5
+ALL_PAIRS_BLOCK_ROWS = 256
+
+
+def find_duplicate_frames(frame_ids, hashes, hamming_threshold=5, all_pairs=False):
+    """
+    Flag frame pairs whose pHashes are within `hamming_threshold` bits.
+
+    By default only adjacent kept frames are compared. With `all_pairs=True`
+    every pair is compared, which also catches footage that is reused later
+    in the video; the upper triangle of the (N, N) distance matrix is built
+    ALL_PAIRS_BLOCK_ROWS rows at a time so memory stays bounded for long videos.
+    """
+    if all_pairs:
+        blocks_a, blocks_b = [], []
+        for start in range(0, len(hashes), ALL_PAIRS_BLOCK_ROWS):
+            rows = hashes[start:start + ALL_PAIRS_BLOCK_ROWS]
+            # Columns from `start` on cover everything right of this block's diagonal
+            distances = hamming_distance(rows[:, None], hashes[None, start:])
+            row, col = np.nonzero(distances <= hamming_threshold)
+            upper = col > row
+            blocks_a.append(start + row[upper])
+            blocks_b.append(start + col[upper])
+        idx_a = np.concatenate(blocks_a) if blocks_a else np.empty(0, dtype=np.intp)
+        idx_b = np.concatenate(blocks_b) if blocks_b else np.empty(0, dtype=np.intp)
+    else:
+        # Adjacent pairs compared in one vectorized xor + popcount
+        distances = hamming_distance(hashes[:-1], hashes[1:])
+        idx_a = np.flatnonzero(distances <= hamming_threshold)
+        idx_b = idx_a + 1
+    duplicate_pairs = list(zip(frame_ids[idx_a].tolist(), frame_ids[idx_b].tolist()))
 
     return {
-        "total_frames_extracted": total_frames,
+        "total_frames_extracted": len(frame_ids),
         "duplicate_count": len(duplicate_pairs),
         "duplicate_frame_pairs": pd.DataFrame(duplicate_pairs, columns=["Frame A", "Frame B"])
     }
+
+
+def scan_video(video_path, frame_skip=5, ocr_skip=None, change_threshold=8, ocr_api=None):
+    """
+    Stream the video once, hashing every kept frame as it is decoded.
+
+    When `ocr_skip` is given, every `ocr_skip`-th frame is OCR'd on the spot
+    unless its pHash is within `change_threshold` bits of the last frame that
+    was OCR'd (static graphics, tickers, talking heads). No frames are held
+    in memory beyond the one being decoded.
+
+    Pass `ocr_api` (from load_ocr_api()) when running off the Streamlit
+    script thread, so the cached resource is never touched from a worker.
+
+    Returns:
+        tuple: (frame_ids int ndarray (N,), hashes uint64 ndarray (N,), visible text str)
+    """
+    if ocr_skip is not None and ocr_skip % frame_skip != 0:
+        raise ValueError(
+            f"ocr_skip ({ocr_skip}) must be a multiple of frame_skip ({frame_skip})"
+        )
+
+    api = None
+    if ocr_skip is not None:
+        api = ocr_api if ocr_api is not None else load_ocr_api()
+    frame_ids = []
+    hashes = []
+    visible_text = []
+    last_ocr_hash = None
+
+    for frame_id, gray in iter_gray_frames(video_path, frame_skip):
+        phash = compute_phash(gray)
+        frame_ids.append(frame_id)
+        hashes.append(phash)
+
+        if api is None or frame_id % ocr_skip != 0:
+            continue
+        if last_ocr_hash is not None and hamming_distance(phash, last_ocr_hash) <= change_threshold:
+            continue
+        last_ocr_hash = phash
+        with _OCR_LOCK:
+            text = ocr_image(api, gray)
+        if text.strip():
+            visible_text.append(text.strip())
+
+    return (
+        np.asarray(frame_ids, dtype=np.int64),
+        np.asarray(hashes, dtype=np.uint64),
+        "\n".join(visible_text),
+    )
+
+
+def analyze_video(video_path, frame_skip=5, ocr_skip=30, hamming_threshold=5, change_threshold=8, all_pairs=False, ocr_api=None):
+    """
+    Decode the video once and run both duplicate detection and OCR on it.
+
+    `ocr_skip` must be a multiple of `frame_skip` so the OCR frames are
+    among the decoded ones.
+
+    Returns:
+        tuple: (duplicate report dict, visible text str)
+    """
+    frame_ids, hashes, visible_text = scan_video(video_path, frame_skip, ocr_skip, change_threshold, ocr_api)
+    duplicate_report = find_duplicate_frames(frame_ids, hashes, hamming_threshold, all_pairs)
+    return duplicate_report, visible_text
+
+
+def analyze_video_for_duplicates(video_path, frame_skip=5, hamming_threshold=5, all_pairs=False):
+    frame_ids, hashes, _ = scan_video(video_path, frame_skip)
+    return find_duplicate_frames(frame_ids, hashes, hamming_threshold, all_pairs)
+
+
+def extract_visible_text_from_frames(video_path, frame_skip=30, change_threshold=8):
+    _, _, visible_text = scan_video(video_path, frame_skip, frame_skip, change_threshold)
+    return visible_text